@@ -1,32 +1,24 @@
 # dash_app.py
-import os
-import json
-import pandas as pd
 import dash
 from dash import html, dcc
 from dash.dependencies import Input, Output
 import plotly.express as px
-
-# ─── Data Paths ─────────────────────────────────────────────────────────────
-BASE_DIR = os.path.dirname(__file__)
-CSV_PATH = os.path.join(BASE_DIR, 'california_infectious_diseases.csv')
-GEOJSON_PATH = os.path.join(BASE_DIR, 'california-counties.geojson')
+import dashboard_lib
 
 # ─── Load Data ──────────────────────────────────────────────────────────────
-if not os.path.exists(CSV_PATH) or not os.path.exists(GEOJSON_PATH):
+if not dashboard_lib.data_files_exist():
     raise FileNotFoundError('CSV or GeoJSON file not found in project directory')
 
-# Master DataFrame
-df = pd.read_csv(CSV_PATH)
-# GeoJSON for choropleth
-with open(GEOJSON_PATH) as f:
-    counties_geo = json.load(f)
+# Master DataFrame plus its precomputed filter options and summaries
+df, filter_options, year_starts, summaries = dashboard_lib.load_data()
+# GeoJSON for choropleth, with the counties it can draw and its feature id key
+counties_geo, map_counties, feature_key = dashboard_lib.load_geo()
 
 # ─── Filter Options ─────────────────────────────────────────────────────────
-diseases = ['All Diseases'] + sorted(df['Disease'].unique())
-counties = ['All Counties'] + sorted(df['County'].unique())
-years = ['All Years'] + sorted(df['Year'].astype(str).unique())
-sexes = ['All'] + sorted(df['Sex'].unique())
+diseases = filter_options['diseases']
+counties = filter_options['counties']
+years = filter_options['years'] # 'All Years' followed by int years
+sexes = filter_options['sexes']
 
 # ─── Dash App Initialization ─────────────────────────────────────────────────
 app = dash.Dash(__name__, title='California Infectious Disease Dashboard')
@@ -52,7 +44,7 @@ app.layout = html.Div([
         ], style={'width':'24%', 'display':'inline-block'}),
         html.Div([
             html.Label('Year'),
-            dcc.Dropdown(id='year-filter', options=[{'label':y,'value':y} for y in years], value='All Years', clearable=False)
+            dcc.Dropdown(id='year-filter', options=[{'label':str(y),'value':y} for y in years], value='All Years', clearable=False)
         ], style={'width':'24%', 'display':'inline-block'}),
         html.Div([
             html.Label('Sex'),
@@ -98,17 +90,13 @@ app.callback(
      Input('sex-filter','value')]
 )
 def update_dashboard(disease, county, year, sex):
-    # Filter DataFrame
-    dff = df.copy()
-    if disease!='All Diseases': dff = dff[dff['Disease']==disease]
-    if county != 'All Counties': dff = dff[dff['County']==county]
-    if year   != 'All Years':    dff = dff[dff['Year']==int(year)]
-    if sex    != 'All':         dff = dff[dff['Sex']==sex]
+    # Filter and aggregate with the same code path as the Streamlit app
+    year_agg, map_data = dashboard_lib.compute_views(df, year_starts, summaries, map_counties, disease, county, year, sex)
 
     # Cards
-    total = dff['Cases'].sum()
-    first = dff['Year'].min() if not dff.empty else None
-    last  = dff['Year'].max() if not dff.empty else None
+    total = int(year_agg['Cases'].sum())
+    first = int(year_agg['Year'].iat[0]) if len(year_agg) else None
+    last  = int(year_agg['Year'].iat[-1]) if len(year_agg) else None
     cards = [
         html.Div([
             html.P('Total Cases', style={'margin':'0','color':'gray'}),
@@ -125,15 +113,13 @@ def update_dashboard(disease, county, year, sex):
     ]
 
     # Bar chart
-    bar_data = dff.groupby('Year')['Cases'].sum().reset_index()
+    bar_data = year_agg
     fig_bar = px.bar(bar_data, x='Year', y='Cases', labels={'Cases':'Number of Cases'}, title='Filtered Data Breakdown', template='plotly_white')
     fig_bar.update_layout(margin={'t':40,'l':40,'r':20,'b':40})
 
     # Map chart
-    map_data = dff.groupby('County')['Cases'].sum().reset_index()
-    map_data['County'] = map_data['County'].str.title()
     fig_map = px.choropleth_mapbox(
-        map_data, geojson=counties_geo, locations='County', featureidkey='properties.NAME',
+        map_data, geojson=counties_geo, locations='County', featureidkey=feature_key,
         color='Cases', hover_data=['County','Cases'], mapbox_style='carto-positron',
         center={'lat':37.5,'lon':-119.5}, zoom=5, opacity=0.6, title='Cases by County Map', template='plotly_white'
     )
@@ -0,0 +1,270 @@
+# dashboard_lib.py
+# Data loading and aggregation shared by streamlit_app.py and dash_app.py.
+# Everything here is plain Python; each app wraps it in its own caching.
+import os
+import json
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# ─── Data Paths ─────────────────────────────────────────────────────────────
+# Get the directory of this module (the project directory)
+BASE_DIR = os.path.dirname(__file__)
+# Define paths to the data files
+CSV_PATH = os.path.join(BASE_DIR, 'california_infectious_diseases.csv')
+GEOJSON_PATH = os.path.join(BASE_DIR, 'california-counties.geojson')
+# Columnar copy of the CSV, written on first load (see load_data)
+PARQUET_PATH = os.path.join(BASE_DIR, 'california_infectious_diseases.parquet')
+# Reduced copy of the GeoJSON, written on first load (see load_geo)
+SIMPLIFIED_GEO_PATH = os.path.join(BASE_DIR, 'counties.simplified.pkl')
+
+def data_files_exist():
+    return os.path.exists(CSV_PATH) and os.path.exists(GEOJSON_PATH)
+
+def data_version():
+    # Modification times of the data files and of this module, used as part of
+    # cache keys so that editing either file, or the code that derives results
+    # from them, invalidates stale cached results
+    return (os.path.getmtime(CSV_PATH), os.path.getmtime(GEOJSON_PATH), os.path.getmtime(__file__))
+
+# ─── Data Loading ───────────────────────────────────────────────────────────
+def _write_atomically(path, write):
+    # Write through a temporary file in the same directory and rename it into
+    # place, so neither app ever reads a half-written cache file. write(tmp_path)
+    # does the writing. Failures are ignored: on a read-only deployment or a full
+    # disk the caller just rebuilds from the source again on the next load
+    directory, name = os.path.split(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    except OSError:
+        return
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_data():
+    # Parsing CSV is the slowest part of a cold start, so the first load writes
+    # a Parquet copy next to it and later loads read that instead. The copy is
+    # rebuilt whenever the CSV is newer, or when it cannot be read
+    df = None
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(CSV_PATH):
+        try:
+            df = pd.read_parquet(PARQUET_PATH, engine='pyarrow', dtype_backend='pyarrow')
+        except (OSError, ValueError):
+            pass # Damaged copy (pyarrow's ArrowInvalid is a ValueError): rebuild it below
+    if df is None:
+        # pyarrow's multithreaded parser, producing the same Arrow-backed
+        # columns as the Parquet read above
+        df = pd.read_csv(CSV_PATH, engine='pyarrow', dtype_backend='pyarrow')
+        _write_atomically(PARQUET_PATH, lambda tmp_path: df.to_parquet(tmp_path, engine='pyarrow', index=False))
+    # Missing case counts contribute nothing to any sum; with them filled the
+    # counts fit in int32, half the bytes of the default 64-bit column
+    df['Cases'] = df['Cases'].fillna(0).astype('int32')
+    # Store the filter columns as ordered categoricals; their sorted categories
+    # double as the dropdown options below
+    for column in ('Disease', 'County', 'Sex'):
+        df[column] = pd.Categorical(df[column], categories=sorted(df[column].unique()), ordered=True)
+    # Normalize county casing so names match the GeoJSON feature ids. Renaming
+    # the ~60 categories is far cheaper than title-casing every row
+    df['County'] = df['County'].cat.rename_categories(df['County'].cat.categories.str.title())
+    # Years fit comfortably in int16, a quarter of the bytes scanned per pass
+    df['Year'] = df['Year'].astype('int16')
+    # Sort by Year so each year is a contiguous block of rows, and record where
+    # each block starts: year_starts[i] is the first row of year (first year + i)
+    df = df.sort_values(['Year', 'Disease', 'County', 'Sex']).reset_index(drop=True)
+    year_starts = np.searchsorted(df['Year'].to_numpy(), np.arange(df['Year'].min(), df['Year'].max() + 2))
+    # Options for the filter dropdowns, computed once per data load. Years stay
+    # ints (the dropdowns format them for display) and the lists are tuples
+    # so shared cached values cannot be mutated by accident
+    filter_options = {
+        'diseases': ('All Diseases',) + tuple(df['Disease'].cat.categories),
+        'counties': ('All Counties',) + tuple(df['County'].cat.categories),
+        'years': ('All Years',) + tuple(int(y) for y in np.unique(df['Year'].to_numpy())),
+        'sexes': ('All',) + tuple(df['Sex'].cat.categories),
+    }
+    # Per-(Disease, Sex) totals by Year and by County: a few thousand rows that
+    # answer the common "all counties, all years" views without a full scan
+    summaries = {
+        'year': df.groupby(['Disease', 'Sex', 'Year'], observed=True)['Cases'].sum(),
+        'county': df.groupby(['Disease', 'Sex', 'County'], observed=True)['Cases'].sum(),
+    }
+    return df, filter_options, year_starts, summaries
+
+# Grid the county outlines are snapped to: 3 decimals is ~110 m, well below
+# a pixel at the map's zoom level
+GEO_DECIMALS = 3
+
+def _snap_ring(ring):
+    # Snap a ring's vertices to the grid and drop consecutive duplicates. Borders
+    # shared by two counties snap to the same points, so neighbours still meet.
+    # Returns None when the ring collapses (a closed ring needs 4 points)
+    snapped = []
+    for point in ring:
+        point = [round(point[0], GEO_DECIMALS), round(point[1], GEO_DECIMALS)]
+        if not snapped or snapped[-1] != point:
+            snapped.append(point)
+    return snapped if len(snapped) >= 4 else None
+
+def _snap_polygon(rings):
+    # The first ring is the outline; holes that collapse are simply dropped
+    outline = _snap_ring(rings[0])
+    if outline is None:
+        return None
+    return [outline] + [ring for ring in map(_snap_ring, rings[1:]) if ring is not None]
+
+def _preprocess_geojson(path):
+    # Reduce the county GeoJSON to what the map needs: the county name (title-
+    # cased the same way as the CSV) as the only property, and outlines snapped
+    # to a coarser grid, which removes more than half the vertices. This shrinks
+    # the parse and every map figure that embeds the geometry
+    with open(path) as f:
+        geo = json.load(f)
+
+    for feature in geo.get('features', []):
+        properties = feature.get('properties', {})
+        name_key = 'NAME' if 'NAME' in properties else 'name'
+        feature['properties'] = {name_key: properties[name_key].title()} if name_key in properties else {}
+        geometry = feature['geometry']
+        polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+        # Tiny islands can vanish on the grid; a county that would vanish
+        # entirely keeps its original outline
+        snapped = [polygon for polygon in map(_snap_polygon, polygons) if polygon is not None]
+        if snapped:
+            geometry['coordinates'] = snapped[0] if geometry['type'] == 'Polygon' else snapped
+    return geo
+
+def load_geo():
+    # The reduced GeoJSON is pickled next to the source on first load and rebuilt
+    # whenever the source, or this module's preprocessing, is newer, or when the
+    # pickle cannot be read
+    counties_geo = None
+    source_mtime = max(os.path.getmtime(GEOJSON_PATH), os.path.getmtime(__file__))
+    if os.path.exists(SIMPLIFIED_GEO_PATH) and os.path.getmtime(SIMPLIFIED_GEO_PATH) >= source_mtime:
+        try:
+            with open(SIMPLIFIED_GEO_PATH, 'rb') as f:
+                counties_geo = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, OSError):
+            pass # Damaged copy: rebuild it below
+    if counties_geo is None:
+        counties_geo = _preprocess_geojson(GEOJSON_PATH)
+
+        def dump(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(counties_geo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _write_atomically(SIMPLIFIED_GEO_PATH, dump)
+    # Counties that can be drawn on the map, in GeoJSON feature order (the CSV
+    # also has a statewide 'California' row). Map values are aligned to this order
+    map_counties = tuple(dict.fromkeys(
+        name for feature in counties_geo.get('features', []) for name in feature['properties'].values()
+    ))
+    # Determine the correct GeoJSON feature key (e.g., 'properties.NAME' or 'properties.name')
+    feature_key = 'properties.NAME' # Default assumption
+    if counties_geo.get('features'):
+        # Check the properties of the first feature to find the county name key
+        properties = counties_geo['features'][0].get('properties', {})
+        if 'name' in properties and 'NAME' not in properties:
+            feature_key = 'properties.name'
+    return counties_geo, map_counties, feature_key
+
+# ─── Filtering & Aggregation ────────────────────────────────────────────────
+def group_sums(keys, weights, n_groups):
+    # Sum weights per integer group key in a single pass; the row counts tell
+    # groups with no matching rows apart from groups whose cases sum to zero.
+    # bincount always sums in float64, so cast back to the weights' integer dtype
+    # to match what the summary path returns
+    sums = np.bincount(keys, weights=weights, minlength=n_groups).astype(weights.dtype)
+    return sums, np.bincount(keys, minlength=n_groups)
+
+def compute_views(df, year_starts, summaries, map_counties, disease, county, year, sex):
+    # Filter the data for the current selections and reduce it to the two small
+    # aggregates the dashboards plot: cases per year and cases per (mappable)
+    # county. Filters are fused into one boolean mask over the integer category
+    # codes, and the per-group sums are NumPy bincounts rather than pandas groupbys.
+    # df, year_starts and summaries are the outputs of load_data
+    if county == 'All Counties' and year == 'All Years':
+        # Only Disease and Sex are filtered: read the precomputed summaries
+        selection = (slice(None) if disease == 'All Diseases' else disease,
+                     slice(None) if sex == 'All' else sex,
+                     slice(None))
+        by_year = summaries['year'].loc[selection].groupby(level='Year').sum()
+        by_county = summaries['county'].loc[selection].groupby(level='County', observed=True).sum()
+        year_agg = pd.DataFrame({'Year': by_year.index.to_numpy(), 'Cases': by_year.to_numpy()})
+    else:
+        first_year = int(df['Year'].iat[0])
+        rows = slice(None)
+        if year != 'All Years':
+            # A single year is a contiguous, zero-copy slice of the Year-sorted data
+            offset = year - first_year
+            rows = slice(year_starts[offset], year_starts[offset + 1])
+
+        county_codes = df['County'].cat.codes.to_numpy()[rows]
+        mask = np.ones(len(county_codes), dtype=bool)
+        for column, value, all_label in (('Disease', disease, 'All Diseases'),
+                                         ('County', county, 'All Counties'),
+                                         ('Sex', sex, 'All')):
+            if value != all_label:
+                code = df[column].cat.categories.get_loc(value)
+                mask &= df[column].cat.codes.to_numpy()[rows] == code
+
+        cases = df['Cases'].to_numpy()[rows][mask]
+        year_keys = df['Year'].to_numpy()[rows][mask] - first_year
+        n_years = len(year_starts) - 1
+        year_cases, year_rows = group_sums(year_keys, cases, n_years)
+        county_categories = df['County'].cat.categories
+        county_cases, _ = group_sums(county_codes[mask], cases, len(county_categories))
+        by_county = pd.Series(county_cases, index=county_categories)
+
+        observed_years = year_rows > 0
+        year_agg = pd.DataFrame({
+            'Year': np.arange(first_year, first_year + n_years, dtype=df['Year'].dtype)[observed_years],
+            'Cases': year_cases[observed_years]
+        })
+    # One row per GeoJSON feature, in feature order, with counties that have no
+    # matching rows counted as zero. The map's locations then never change and
+    # only the values need updating
+    map_data = pd.DataFrame({
+        'County': map_counties,
+        'Cases': by_county.reindex(list(map_counties), fill_value=0).to_numpy()
+    })
+    return year_agg, map_data
+
+# ─── Map Figure ─────────────────────────────────────────────────────────────
+def build_base_map(counties_geo, feature_key, locations):
+    # The county choropleth without any values. The geometry and the locations
+    # (the map_counties order compute_views aligns to) never change, so callers
+    # build this once, copy it and only set z and customdata on the copy
+    fig = go.Figure(go.Choroplethmapbox(
+        geojson=counties_geo,
+        featureidkey=feature_key, # Path to feature id in GeoJSON
+        locations=locations, # County names matched against the GeoJSON feature ids
+        colorscale="Viridis", # Color scale for the choropleth
+        marker_opacity=0.7, # Opacity of the choropleth layer
+        marker_line_width=0.3, # Thin borders keep hover redraws cheap
+        hovertemplate='%{customdata[0]}<extra></extra>',
+        colorbar=dict(title="Cases") # Title for the color bar
+    ))
+    fig.update_layout(
+        mapbox_style='carto-positron', # Mapbox style
+        mapbox_center={'lat': 37.5, 'lon': -119.5}, # Center of the map
+        mapbox_zoom=4.5, # Initial zoom level
+        margin=dict(t=30, l=0, r=0, b=0), # Adjust map margins
+        uirevision='static' # Keep the user's zoom/pan across reruns instead of re-tiling
+    )
+    return fig
+
+# ─── Main ───────────────────────────────────────────────────────────────────
+# `python dashboard_lib.py` builds the Parquet and reduced GeoJSON copies ahead
+# of time (e.g. when building a deployment image), so no visitor pays for the
+# CSV parse or the GeoJSON preprocessing
+if __name__ == '__main__':
+    load_data()
+    load_geo()
+    print(f'Data caches up to date: {PARQUET_PATH}, {SIMPLIFIED_GEO_PATH}')